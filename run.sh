@@ -9,6 +9,7 @@ source venv/bin/activate
 
 
 # The program is run with the following command:
-exec uvicorn --reload --host "$HOST" --port "$PORT" "$APP_MODULE"
+# uvloop + httptools replace the pure-Python event loop and HTTP parser
+exec uvicorn --reload --loop uvloop --http httptools --ws-ping-interval 30 --ws-ping-timeout 20 --host "$HOST" --port "$PORT" "$APP_MODULE"
 
 # uvicorn app.main:app --reload --workers 1 --host 0.0.0.0 --port 8003
\ No newline at end of file
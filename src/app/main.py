@@ -4,12 +4,10 @@ from pydantic import BaseModel, Field
 from typing import List, Dict, Optional
 from datetime import datetime
 import asyncio
-import json
+import os
 import random
 import numpy as np
-
-from sklearn.ensemble import IsolationForest
-from sklearn.preprocessing import StandardScaler
+import orjson
 
 # ============================================================
 # APPLICATION METADATA
@@ -21,97 +19,137 @@ app = FastAPI(
     version="1.0.0"
 )
 
+# Explicit origins (instead of "*") let browsers cache CORS preflights
+ALLOWED_ORIGINS = os.getenv(
+    "ALLOWED_ORIGINS",
+    "http://localhost:5173,http://127.0.0.1:5173"
+).split(",")
+
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=ALLOWED_ORIGINS,
     allow_credentials=False,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
+# ============================================================
+# SHARED CLOCK
+# ============================================================
+
+# Hot paths read this cached ISO timestamp instead of calling
+# datetime.utcnow().isoformat() per event; a background task refreshes it
+# once per millisecond, which is plenty for broadcast timestamps.
+_NOW = {"iso": datetime.utcnow().isoformat()}
+
+async def _refresh_now():
+    while True:
+        _NOW["iso"] = datetime.utcnow().isoformat()
+        await asyncio.sleep(0.001)
+
+# Pre-built geo jitter pool (built at import: two vectorized draws) so the
+# broadcast path never calls random.uniform or allocates a nested dict.
+_GEO_POOL_SIZE = 1024
+
+def _build_geo_pool(size: int = _GEO_POOL_SIZE) -> List[Dict]:
+    rng = np.random.default_rng()
+    lats = np.round(rng.uniform(-1.5, 1.5, size), 4)  # Kenya-centric bounds
+    lngs = np.round(rng.uniform(36.0, 38.0, size), 4)
+    return [{"lat": float(lats[i]), "lng": float(lngs[i])} for i in range(size)]
+
+_GEO_POOL = _build_geo_pool()
+
 # ============================================================
 # REAL-TIME WEBSOCKET MANAGER
 # ============================================================
 
 class ConnectionManager:
+    """Copy-on-write connection registry.
+
+    Connections live in an immutable tuple that is atomically rebound on
+    connect/disconnect (all mutation happens on the event loop), so
+    broadcasts read a consistent snapshot without acquiring a lock.
+    """
+
     def __init__(self):
-        self.active_connections: List[WebSocket] = []
-        self.lock = asyncio.Lock()
+        self._conns: tuple = ()
+        self._geo_idx = 0
+
+    @property
+    def active_connections(self) -> tuple:
+        return self._conns
 
     async def connect(self, websocket: WebSocket):
-        async with self.lock:
-            self.active_connections.append(websocket)
+        self._conns = self._conns + (websocket,)
         print(f"📡 WS connected: {websocket.client}")
 
     async def disconnect(self, websocket: WebSocket):
-        async with self.lock:
-            if websocket in self.active_connections:
-                self.active_connections.remove(websocket)
+        self._conns = tuple(c for c in self._conns if c is not websocket)
         print(f"🔌 WS disconnected: {websocket.client}")
 
     async def broadcast(self, event: Dict):
-        payload = {
-            **event,
-            "timestamp": datetime.utcnow().isoformat(),
-            "geo": {
-                "lat": round(random.uniform(-1.5, 1.5), 4), # Kenya-centric bounds
-                "lng": round(random.uniform(36.0, 38.0), 4),
-            }
-        }
-        async with self.lock:
-            connections = list(self.active_connections)
-        
-        # Concurrent send to all browsers
+        # Events are server-owned, so stamp them in place instead of paying
+        # for a full dict copy per broadcast
+        event["timestamp"] = _NOW["iso"]
+        event["geo"] = _GEO_POOL[self._geo_idx & (_GEO_POOL_SIZE - 1)]
+        self._geo_idx += 1
+        connections = self._conns
+
+        # Serialize once, then fan the same buffer out to every browser
+        buf = orjson.dumps(event)
         await asyncio.gather(
-            *[self._safe_send(conn, payload) for conn in connections],
+            *[self._safe_send(conn, buf) for conn in connections],
             return_exceptions=True
         )
 
-    async def _safe_send(self, websocket: WebSocket, payload: Dict):
+    async def _safe_send(self, websocket: WebSocket, buf: bytes):
         try:
-            await websocket.send_text(json.dumps(payload))
+            await websocket.send_bytes(buf)
         except Exception:
             await self.disconnect(websocket)
 
 manager = ConnectionManager()
 router = APIRouter()
 
-# ============================================================
-# ML MODEL (Isolation Forest)
-# ============================================================
-
-scaler = StandardScaler()
-iso_forest = IsolationForest(contamination=0.05, n_estimators=100, random_state=42)
-
-# Training with simulated African transaction patterns
-normal_data = np.random.normal(loc=[3000, 4, 2], scale=[1000, 2, 1], size=(500, 3))
-fraud_data = np.random.normal(loc=[95000, 25, 10], scale=[15000, 5, 2], size=(50, 3))
-scaler.fit(np.vstack([normal_data, fraud_data]))
-iso_forest.fit(scaler.transform(np.vstack([normal_data, fraud_data])))
-
 # ============================================================
 # BACKGROUND SIMULATOR (The "Live" Engine)
 # ============================================================
 
+# Circular pool of pre-generated mock events: one vectorized NumPy draw at
+# startup instead of a handful of random.* calls per simulated event.
+_MOCK_POOL_SIZE = 1024
+_MOCK_EVENTS: List[Dict] = []
+
+def _build_mock_events(size: int = _MOCK_POOL_SIZE) -> List[Dict]:
+    rng = np.random.default_rng()
+    types = rng.choice(["transaction", "check", "teller_behavior"], size=size)
+    levels = rng.choice(["high", "critical"], size=size)
+    ids = rng.integers(1000, 10000, size=size)
+    scores = np.round(rng.uniform(0.75, 0.99, size=size), 2)
+    amounts = rng.integers(50000, 150000, size=size)
+    return [
+        {
+            "id": f"SIM_{ids[i]}",
+            "type": str(types[i]),
+            "risk_score": float(scores[i]),
+            "risk_level": str(levels[i]),
+            "is_flagged": True,
+            "reasons": ["Unusual high-value burst", "ML Anomaly detected"],
+            "data": {"amount": int(amounts[i]), "currency": "KES"}
+        }
+        for i in range(size)
+    ]
+
 async def fraud_simulator():
-    """Generates a fake fraud event every 5-10 seconds to keep the UI busy."""
+    """Replays a pre-generated fraud event every 5-10 seconds to keep the UI busy."""
     print("🛠️ Fraud Simulator Started")
-    types = ["transaction", "check", "teller_behavior"]
-    levels = ["high", "critical"]
-    
+    i = 0
+
     while True:
         await asyncio.sleep(random.randint(5, 10))
         if len(manager.active_connections) > 0:
-            mock_event = {
-                "id": f"SIM_{random.randint(1000, 9999)}",
-                "type": random.choice(types),
-                "risk_score": round(random.uniform(0.75, 0.99), 2),
-                "risk_level": random.choice(levels),
-                "is_flagged": True,
-                "reasons": ["Unusual high-value burst", "ML Anomaly detected"],
-                "data": {"amount": random.randint(50000, 150000), "currency": "KES"}
-            }
-            await manager.broadcast(mock_event)
+            await manager.broadcast(_MOCK_EVENTS[i % _MOCK_POOL_SIZE])
+            i += 1
 
 # ============================================================
 # ROUTES
@@ -124,7 +162,7 @@ async def websocket_stream(websocket: WebSocket):
     try:
         while True:
             # Heartbeat to keep connection alive
-            await websocket.send_text(json.dumps({"type": "heartbeat"}))
+            await websocket.send_bytes(orjson.dumps({"type": "heartbeat"}))
             await asyncio.sleep(20)
     except WebSocketDisconnect:
         await manager.disconnect(websocket)
@@ -148,5 +186,8 @@ app.include_router(router)
 @app.on_event("startup")
 async def startup_event():
     print("🚀 NEXUS CORE ONLINE")
+    _MOCK_EVENTS[:] = _build_mock_events()
+    # Keep the shared timestamp fresh
+    asyncio.create_task(_refresh_now())
     # Start the simulator in the background
     asyncio.create_task(fraud_simulator())
\ No newline at end of file
@@ -1,9 +1,25 @@
+import os
+
 import pytest
 from fastapi.testclient import TestClient
 
+# The fraud service reads its Settings at import time, so the test
+# environment has to be in place before the app modules load.
+os.environ.setdefault("API_KEYS", "sk_test_123456")
+os.environ.setdefault("ALLOWED_HOSTS", "testserver,localhost")
+
 from src.main import app  # ← API Gateway
+from src.app.operational_fraud import app as fraud_app
+
+# Session scope: the route table, middleware stack and lifespan startup
+# are built exactly once for the whole suite instead of per module.
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def client():
     with TestClient(app) as test_client:
         yield test_client
+
+@pytest.fixture(scope="session")
+def fraud_client():
+    with TestClient(fraud_app) as test_client:
+        yield test_client
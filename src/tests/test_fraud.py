@@ -3,64 +3,118 @@ Unit tests for fraud detection system
 Run with: pytest test_fraud_detection.py -v
 """
 
+import asyncio
+import os
+import statistics
+import types
+
 import pytest
+import httpx
+import orjson
+import numpy as np
 from fastapi.testclient import TestClient
 from datetime import datetime
 import json
 
-# Import your app (adjust import path)
-# from main import app, settings
+from src.app.operational_fraud import app as fraud_app
+from src.app.operational_fraud import (
+    cached_teller_score,
+    compile_rules,
+    score_tellers,
+    _score_teller,
+)
+
+ANALYZE_URL = "/api/v1/fraud/transactions/analyze"
+AUTH_HEADERS = {"Authorization": "Bearer sk_test_123456"}
+# Bodies are pre-encoded with orjson (bytes out, no str encode step), so
+# the content type has to be set explicitly
+JSON_AUTH_HEADERS = {**AUTH_HEADERS, "Content-Type": "application/json"}
+
+# Canonical payloads, built once at module scope and frozen against
+# accidental mutation; tests derive variants with {**BASE_TX, ...} instead
+# of rebuilding the whole dict per call.
+BASE_TX = types.MappingProxyType({
+    "user_id": "user_123",
+    "amount": 5000,
+    "avg_transaction_amount": 5000,
+    "transaction_count_24h": 2,
+    "unique_locations_24h": 1,
+    "ip_address": "192.168.1.1"
+})
+
+BASE_CHECK = types.MappingProxyType({
+    "check_number": "CHK_12345",
+    "amount": 50000,
+    "is_stolen": False,
+    "is_duplicate": False,
+    "is_altered": False,
+    "signature_match_score": 0.95
+})
+
+PAYLOAD_MISSING_AMOUNT = types.MappingProxyType({"user_id": "user_123"})
 
-# For testing purposes, create a mock app
-from fastapi import FastAPI, Depends, HTTPException
-from pydantic import BaseModel
+# Already bytes: no per-call str.encode when posted as content
+_INVALID_JSON = b"invalid json"
 
-client = TestClient(app := FastAPI())
+# Point the async tests at a live deployment instead of the in-process app
+NEXUS_TEST_BASE_URL = os.getenv("NEXUS_TEST_BASE_URL")
+
+def _async_client() -> httpx.AsyncClient:
+    """One client configuration shared by every async test.
+
+    Against a live server, pooled keepalive connections amortize the
+    TCP handshake across requests and avoid TIME_WAIT buildup. The
+    default in-process ASGI transport opens no sockets at all, so no
+    pool limits apply there and the per-test semaphore governs
+    concurrency.
+    """
+    if NEXUS_TEST_BASE_URL:
+        return httpx.AsyncClient(
+            base_url=NEXUS_TEST_BASE_URL,
+            limits=httpx.Limits(max_keepalive_connections=64, max_connections=128),
+        )
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=fraud_app),
+        base_url="http://testserver",
+    )
 
 # ============================================================
 # TEST FIXTURES
 # ============================================================
 
+@pytest.fixture(scope="session", autouse=True)
+def warm_teller_kernel():
+    """Trigger the one-time numba compile of the teller kernel up front
+    so individual tests only ever measure steady-state native calls"""
+    _score_teller(0.0, 0, 0)
+
 @pytest.fixture
 def valid_api_key():
     return "sk_test_123456"
 
 @pytest.fixture
 def valid_transaction():
-    return {
-        "user_id": "user_123",
-        "amount": 5000,
-        "avg_transaction_amount": 5000,
-        "transaction_count_24h": 2,
-        "unique_locations_24h": 1,
-        "ip_address": "192.168.1.1"
-    }
+    # Copy: proxies aren't JSON-serializable and callers may mutate
+    return {**BASE_TX}
 
 @pytest.fixture
 def suspicious_transaction():
     return {
+        **BASE_TX,
         "user_id": "user_456",
         "amount": 500000,  # Very high
-        "avg_transaction_amount": 5000,
         "transaction_count_24h": 100,  # Very high
-        "unique_locations_24h": 10,  # Very high
-        "ip_address": "192.168.1.1"
+        "unique_locations_24h": 10  # Very high
     }
 
 @pytest.fixture
 def valid_check():
-    return {
-        "check_number": "CHK_12345",
-        "amount": 50000,
-        "is_stolen": False,
-        "is_duplicate": False,
-        "is_altered": False,
-        "signature_match_score": 0.95
-    }
+    return {**BASE_CHECK}
 
 @pytest.fixture
 def suspicious_check():
     return {
+        **BASE_CHECK,
         "check_number": "CHK_99999",
         "amount": 100000,
         "is_stolen": True,
@@ -75,28 +129,31 @@ def suspicious_check():
 
 class TestAuthentication:
     
-    def test_missing_api_key(self):
+    def test_missing_api_key(self, fraud_client):
         """Should reject requests without API key"""
-        response = client.post(
+        response = fraud_client.post(
             "/api/v1/fraud/transactions/analyze",
             json={"amount": 1000}
         )
         assert response.status_code == 403 or response.status_code == 401
-    
-    def test_invalid_api_key(self):
+
+    def test_invalid_api_key(self, fraud_client):
         """Should reject invalid API key"""
-        response = client.post(
+        response = fraud_client.post(
             "/api/v1/fraud/transactions/analyze",
             headers={"Authorization": "Bearer invalid_key"},
             json={"amount": 1000}
         )
         assert response.status_code in [403, 401]
-    
-    def test_valid_api_key(self, valid_api_key, valid_transaction):
+
+    def test_valid_api_key(self, fraud_client, valid_api_key, valid_transaction):
         """Should accept valid API key"""
-        # This will fail without proper API key setup
-        # For real testing, mock the verify_api_key function
-        pass
+        response = fraud_client.post(
+            "/api/v1/fraud/transactions/analyze",
+            headers={"Authorization": f"Bearer {valid_api_key}"},
+            json=valid_transaction
+        )
+        assert response.status_code == 200
 
 # ============================================================
 # TRANSACTION ANALYSIS TESTS
@@ -193,50 +250,132 @@ class TestCheckAnalysis:
 
 class TestTellerAnalysis:
     
-    def test_normal_teller_behavior(self):
-        """Normal teller activity should be low risk"""
-        risk_score = 0.0
-        risk_level = "low"
-        
-        assert risk_score < 0.70
-        assert risk_level == "low"
-    
-    def test_high_cash_variance(self):
-        """High cash variance should flag risk"""
-        cash_variance = 100000
-        base_score = 0.0
-        
-        if cash_variance > 50000:
-            base_score += 0.50
-        
-        assert base_score >= 0.50
-    
-    def test_excessive_overrides(self):
-        """Excessive overrides should increase risk"""
-        overrides = 15
-        base_score = 0.0
-        
-        if overrides > 10:
-            base_score += 0.35
-        
-        assert base_score >= 0.35
+    @pytest.mark.parametrize("cash_variance,overrides,transactions,expected", [
+        (0, 0, 0, 0.0),
+        (100000, 0, 0, 0.50),
+        (20000, 0, 0, 0.30),
+        (0, 15, 0, 0.35),
+        (0, 0, 600, 0.25),
+        (100000, 15, 600, 1.0),  # 1.10 uncapped
+    ])
+    def test_teller_risk_thresholds(self, cash_variance, overrides, transactions, expected):
+        """One sweep covers every rule (both variance tiers, overrides,
+        volume and the cap), and keeps the scalar kernel and vectorized
+        scorer in agreement"""
+        risk_score, _ = _score_teller(float(cash_variance), overrides, transactions)
+        batch_scores = score_tellers(
+            np.array([cash_variance], dtype=np.float32),
+            np.array([overrides], dtype=np.float32),
+            np.array([transactions], dtype=np.float32)
+        )
+
+        assert risk_score == pytest.approx(expected)
+        assert batch_scores[0] == pytest.approx(expected)
+
+    def test_compiled_rule_scorer(self):
+        """Compiled rule set should match the hardcoded thresholds"""
+        rules = [
+            {"field": "cash_variance", "op": ">", "val": 50000, "weight": 0.50},
+            {"field": "overrides_used", "op": ">", "val": 10, "weight": 0.35},
+        ]
+        score = compile_rules(rules)
+
+        assert score({"cash_variance": 100000, "overrides_used": 15}) == pytest.approx(0.85)
+        assert score({"cash_variance": 0, "overrides_used": 0}) == 0.0
+        # Identical rule sets share one compiled function
+        assert compile_rules(list(rules)) is score
+
+    def test_teller_score_cache_effectiveness(self):
+        """Skewed inputs should mostly hit the memoized score"""
+        cached_teller_score.cache_clear()
+        rng = np.random.default_rng(42)
+        # A realistic skew: most tellers live in a handful of buckets
+        variance_buckets = rng.choice([0, 5, 60, 120], size=200)
+
+        for bucket in variance_buckets:
+            score, _ = cached_teller_score(int(bucket), 0, 0)
+            assert 0.0 <= score <= 1.0
+
+        info = cached_teller_score.cache_info()
+        assert info.hits / (info.hits + info.misses) > 0.8
 
 # ============================================================
 # RATE LIMITING TESTS
 # ============================================================
 
+class TokenBucket:
+    """Async token bucket that sleeps OUTSIDE its lock.
+
+    The lock guards only the refill/deduct bookkeeping; a coroutine that
+    has to wait releases the lock first, so other acquirers with tokens
+    available proceed immediately instead of queueing behind a sleeper.
+    """
+
+    def __init__(self, capacity: int, per: float = 1.0):
+        self.capacity = capacity
+        self.rate = capacity / per
+        self._tokens = float(capacity)
+        self._last = None
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float):
+        if self._last is not None:
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._last) * self.rate
+            )
+        self._last = now
+
+    async def acquire(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            async with self._lock:
+                self._refill(loop.time())
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            await asyncio.sleep(wait)
+
+# Timing-sensitive tests stay on one xdist worker so parallel runs don't
+# skew their clocks or fight over shared limiter state
+@pytest.mark.xdist_group("ratelimit")
 class TestRateLimiting:
-    
+
     def test_rate_limit_enforcement(self):
-        """Should enforce rate limits"""
-        # Would need actual implementation
-        # Make 101 requests and check if 101st is rejected
-        pass
-    
+        """A full bucket admits its capacity at once, then throttles"""
+
+        async def _run():
+            bucket = TokenBucket(100, per=1.0)
+            loop = asyncio.get_running_loop()
+
+            async def _acquire():
+                await bucket.acquire()
+                return loop.time()
+
+            return await asyncio.gather(*[_acquire() for _ in range(150)])
+
+        times = sorted(asyncio.run(_run()))
+
+        # The first bucketful is admitted without serializing behind any
+        # sleeper; the 50 overflow acquires drip in at the refill rate
+        assert times[99] - times[0] < 0.5
+        assert times[-1] - times[0] >= 0.4
+
     def test_rate_limit_reset(self):
-        """Rate limit should reset after time window"""
-        # Wait for window to reset and verify
-        pass
+        """Tokens refill after the window so acquires succeed again"""
+
+        async def _run():
+            bucket = TokenBucket(2, per=0.2)
+            await bucket.acquire()
+            await bucket.acquire()
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            # Bucket is empty; this acquire must wait for a refill
+            await bucket.acquire()
+            return loop.time() - start
+
+        waited = asyncio.run(_run())
+        assert waited >= 0.05
 
 # ============================================================
 # ERROR HANDLING TESTS
@@ -244,29 +383,54 @@ class TestRateLimiting:
 
 class TestErrorHandling:
     
-    def test_invalid_json_payload(self):
+    def test_invalid_json_payload(self, fraud_client):
         """Should handle invalid JSON gracefully"""
-        response = client.post(
-            "/api/v1/fraud/transactions/analyze",
-            data="invalid json",
-            headers={"Content-Type": "application/json"}
+        response = fraud_client.post(
+            ANALYZE_URL,
+            content=_INVALID_JSON,
+            headers=JSON_AUTH_HEADERS
         )
         assert response.status_code == 422  # Validation error
     
-    def test_missing_required_fields(self):
+    def test_missing_required_fields(self, fraud_client):
         """Should validate required fields"""
-        invalid_data = {
-            "user_id": "user_123"
-            # Missing amount
-        }
-        # Should fail validation
-        assert "amount" not in invalid_data
+        response = fraud_client.post(
+            ANALYZE_URL,
+            content=orjson.dumps({**PAYLOAD_MISSING_AMOUNT}),
+            headers=JSON_AUTH_HEADERS
+        )
+        # Missing amount fails validation
+        assert response.status_code == 422
     
-    def test_database_error_handling(self):
+    def test_database_error_handling(self, fraud_client, monkeypatch):
         """Should handle DB errors gracefully"""
-        # Mock DB connection failure
-        # Verify error response is appropriate
-        pass
+        from unittest.mock import Mock
+
+        from sqlalchemy.exc import OperationalError
+
+        import src.app.operational_fraud as fraud
+
+        # Empty the dashboard TTL cache so the request really hits the DB
+        monkeypatch.setitem(fraud._dash_cache, "payload", None)
+
+        broken_session = Mock()
+        broken_session.execute.side_effect = OperationalError(
+            "SELECT 1", {}, Exception("connection refused")
+        )
+
+        def _broken_db():
+            yield broken_session
+
+        fraud.app.dependency_overrides[fraud.get_db] = _broken_db
+        try:
+            response = fraud_client.get(
+                "/api/v1/fraud/dashboard/summary", headers=AUTH_HEADERS
+            )
+        finally:
+            fraud.app.dependency_overrides.pop(fraud.get_db, None)
+
+        assert response.status_code == 500
+        assert orjson.loads(response.content) == {"detail": "Dashboard unavailable"}
 
 # ============================================================
 # PERFORMANCE TESTS
@@ -274,23 +438,63 @@ class TestErrorHandling:
 
 class TestPerformance:
     
-    def test_response_time_under_1s(self):
+    def test_response_time_under_1s(self, fraud_client, valid_transaction):
         """Analysis should complete in < 1 second"""
         import time
-        start = time.time()
-        # Make request
-        duration = time.time() - start
-        
-        assert duration < 1.0
+
+        # perf_counter_ns is monotonic and nanosecond-resolution, so the
+        # measurement itself can't false-fail the sub-second bound the
+        # way wall-clock time.time() can
+        start = time.perf_counter_ns()
+        response = fraud_client.post(
+            ANALYZE_URL,
+            content=orjson.dumps(valid_transaction),
+            headers=JSON_AUTH_HEADERS
+        )
+        duration_ns = time.perf_counter_ns() - start
+
+        assert response.status_code == 200
+        assert orjson.loads(response.content)["type"] == "transaction"
+        assert duration_ns < 1_000_000_000
     
+    @pytest.mark.xdist_group("ratelimit")
     def test_concurrent_requests(self):
-        """System should handle concurrent requests"""
-        # Use asyncio to make multiple concurrent requests
-        pass
+        """System should handle concurrent requests with bounded fanout"""
+        n_requests = 50
+
+        async def _run():
+            sem = asyncio.Semaphore(64)
+            loop = asyncio.get_running_loop()
+            async with _async_client() as http:
+                async def _fire(body):
+                    async with sem:
+                        start = loop.time()
+                        response = await http.post(
+                            ANALYZE_URL, content=body, headers=JSON_AUTH_HEADERS
+                        )
+                        assert response.status_code == 200
+                        return loop.time() - start
+
+                bodies = [
+                    orjson.dumps({
+                        "user_id": f"user_{i}",
+                        "amount": 5000 + i,
+                        "avg_transaction_amount": 5000,
+                        "transaction_count_24h": 2,
+                        "unique_locations_24h": 1
+                    })
+                    for i in range(n_requests)
+                ]
+                return await asyncio.gather(*[_fire(b) for b in bodies])
+
+        latencies = asyncio.run(_run())
+
+        p95 = statistics.quantiles(latencies, n=20)[18]
+        assert p95 < 1.0
 
 # ============================================================
 # RUN TESTS
 # ============================================================
 
 if __name__ == "__main__":
-    pytest.main([__file__, "-v", "--tb=short"])
\ No newline at end of file
+    pytest.main([__file__, "-v", "--tb=short", "-n", "auto", "--dist", "loadgroup"])
\ No newline at end of file
@@ -1,12 +1,4 @@
-from starlette.testclient import TestClient
-
-from app.main import app
-
-client = TestClient(app)
-
-def test_ping(test_app):
-    response = test_app.get("/ping")
+def test_health(client):
+    response = client.get("/health")
     assert response.status_code == 200
-    assert response.json() == {"ping": "pong!"}
-
-    
\ No newline at end of file
+    assert response.json() == {"status": "healthy", "gateway": "online"}